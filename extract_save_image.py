@@ -5,101 +5,102 @@ small utility script to extract screenshots from fallout 3 and new vegas saves (
 supports PC .fos files and Xbox 360 .fxs saves (based on some ported logic from wxPirs)
 thanks to the fallout wiki for documenting fallout 3's format, xbox and new vegas support is my own.
 
-usage: extract.py [PATH_TO_FILE]
+usage: extract.py [--compress-level 0-9] [PATH_TO_FILE]
 """
 
-import sys
+import argparse
+import functools
+import io
+import mmap
 import struct
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import os
-from typing import List
 
+import numpy as np
 from PIL import Image
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 PIPE = 0x7C
 MAGIC = b"FO3SAVEGAME"
 
+# fixed-layout runs of the save header, each ending at the next string or branch.
+# the B fields are the '|' dividers between values
+HDR_START = struct.Struct("<11sIIBI")   # magic, header size, unknown1, |, width (or nv marker)
+HDR_NV_WIDTH = struct.Struct("<BI")     # |, width
+HDR_FIXED = struct.Struct("<BIBIBHB")   # |, height, |, save index, |, name size, |
+HDR_STR_SIZE = struct.Struct("<BHB")    # |, string size, |
+HDR_LEVEL = struct.Struct("<BIBHB")     # |, level, |, location size, |
+
 
 def read_exact(f, n):
     b = f.read(n)
     if len(b) != n:
-        raise ValueError(f"Unexpected EOF (wanted {n} bytes, got {len(b)})")
+        raise EOFError(f"Unexpected EOF (wanted {n} bytes, got {len(b)})")
     return b
 
 
-def read_u32_le(f):
-    return struct.unpack("<I", read_exact(f, 4))[0]
-
+def check_available(buf, pos, n):
+    avail = max(0, len(buf) - pos)
+    if avail < n:
+        raise EOFError(f"Unexpected EOF (wanted {n} bytes, got {avail})")
 
-def read_u16_le(f):
-    return struct.unpack("<H", read_exact(f, 2))[0]
 
+def unpack_at(buf, pos, st):
+    check_available(buf, pos, st.size)
+    return st.unpack_from(buf, pos), pos + st.size
 
-def read_divider(f):
-    c = read_exact(f, 1)[0]
-    if c != PIPE:
-        raise ValueError(f"Expected divider '|' (0x7C), found 0x{c:02X}")
 
+def check_dividers(*dividers):
+    for c in dividers:
+        if c != PIPE:
+            raise ValueError(f"Expected divider '|' (0x7C), found 0x{c:02X}")
 
 
-def read_bzstring(f, size):
+def read_bzstring(buf, pos, size):
     if size == 0:
-        return ""
-    raw = read_exact(f, size)
-    return raw.decode("latin-1", errors="replace")
+        return "", pos
+    check_available(buf, pos, size)
+    raw = bytes(buf[pos:pos + size])
+    return raw.decode("latin-1", errors="replace"), pos + size
 
 
-def parse_header(f):
-    start_pos = f.tell()
-    file_id = read_exact(f, 11)
+def parse_header(buf, pos=0):
+    # buf is anything sliceable that supports the buffer protocol (bytes, mmap, memoryview)
+    start_pos = pos
+    (file_id, save_header_size, unknown1, d0, val), pos = unpack_at(buf, pos, HDR_START)
     if file_id != MAGIC:
         raise ValueError(f"Bad magic: expected {MAGIC!r}, got {file_id!r}")
+    check_dividers(d0)
 
-    save_header_size = read_u32_le(f)
-    unknown1 = read_u32_le(f)
-
-    read_divider(f)
-    val = read_u32_le(f)
     if val > 16384:
-        f.seek(60, os.SEEK_CUR)
-        read_divider(f)
-        width = read_u32_le(f)
+        pos += 60
+        (d0, width), pos = unpack_at(buf, pos, HDR_NV_WIDTH)
+        check_dividers(d0)
     else:
         width = val
 
-    read_divider(f)
-    height = read_u32_le(f)
-
-    read_divider(f)
-    save_index = read_u32_le(f)
-
-    read_divider(f)
-    pc_name_size = read_u16_le(f)
+    (d0, height, d1, save_index, d2, pc_name_size, d3), pos = unpack_at(buf, pos, HDR_FIXED)
+    check_dividers(d0, d1, d2, d3)
+    pc_name, pos = read_bzstring(buf, pos, pc_name_size)
 
-    read_divider(f)
-    pc_name = read_bzstring(f, pc_name_size)
+    (d0, pc_karma_size, d1), pos = unpack_at(buf, pos, HDR_STR_SIZE)
+    check_dividers(d0, d1)
+    pc_karma, pos = read_bzstring(buf, pos, pc_karma_size)
 
-    read_divider(f)
-    pc_karma_size = read_u16_le(f)
+    (d0, pc_level, d1, pc_location_size, d2), pos = unpack_at(buf, pos, HDR_LEVEL)
+    check_dividers(d0, d1, d2)
+    pc_location, pos = read_bzstring(buf, pos, pc_location_size)
 
-    read_divider(f)
-    pc_karma = read_bzstring(f, pc_karma_size)
-
-    read_divider(f)
-    pc_level = read_u32_le(f)
-
-    read_divider(f)
-    pc_location_size = read_u16_le(f)
-
-    read_divider(f)
-    pc_location = read_bzstring(f, pc_location_size)
-
-    read_divider(f)
-    playtime_size = read_u16_le(f)
-
-    read_divider(f)
-    playtime = read_bzstring(f, playtime_size)
+    (d0, playtime_size, d1), pos = unpack_at(buf, pos, HDR_STR_SIZE)
+    check_dividers(d0, d1)
+    playtime, pos = read_bzstring(buf, pos, playtime_size)
 
     screenshot_offset = 4 + save_header_size
 
@@ -114,29 +115,39 @@ def parse_header(f):
         "playtime": playtime,
         "unknown1": unknown1,
         "screenshot_offset": screenshot_offset,
-        "header_end_pos": f.tell(),
+        "header_end_pos": pos,
         "header_start_pos": start_pos,
     }
 
 MAGIC_CON  = b"CON "
 
-def read_exact(f, n):
-    b = f.read(n)
-    if len(b) != n:
-        raise EOFError(f"Unexpected EOF (wanted %d, got %d)" % (n, len(b)))
-    return b
-
-def r_u8(f):     return struct.unpack("<B", read_exact(f, 1))[0]
-def r_u16le(f):  return struct.unpack("<H", read_exact(f, 2))[0]
-def r_u32le(f):  return struct.unpack("<I", read_exact(f, 4))[0]
-def r_i32le(f):  return struct.unpack("<i", read_exact(f, 4))[0]
+_U8    = struct.Struct("<B")
+_U16LE = struct.Struct("<H")
+_U32LE = struct.Struct("<I")
+_I32LE = struct.Struct("<i")
+
+def r_u8(f):     return _U8.unpack(read_exact(f, 1))[0]
+def r_u16le(f):  return _U16LE.unpack(read_exact(f, 2))[0]
+def r_u32le(f):  return _U32LE.unpack(read_exact(f, 4))[0]
+def r_i32le(f):  return _I32LE.unpack(read_exact(f, 4))[0]
+
+# one 64 byte directory entry. Cluster holds the raw field, the cluster number is its top 24 bits
+ENTRY_DT = np.dtype([
+    ("Filename",  "S38"),
+    ("Unknow",    "<i4"),
+    ("BlockLen",  "<i4"),
+    ("Cluster",   "<u4"),
+    ("Parent",    "<u2"),
+    ("Size",      "<u4"),
+    ("DateTime1", "<u4"),
+    ("DateTime2", "<u4"),
+])
+
+def decode_fixed_str(raw):
+    return raw.split(b"\x00", 1)[0].decode("utf-8", "replace").strip()
 
 def read_fixed_str(f, n):
-    raw = read_exact(f, n)
-    i = raw.find(b"\x00")
-    if i != -1:
-        raw = raw[:i]
-    return raw.decode("utf-8", "replace").strip()
+    return decode_fixed_str(read_exact(f, n))
 
 def dos_datetime_from_u32(v):
     d = (v >> 16) & 0xFFFF
@@ -149,28 +160,45 @@ def dos_datetime_from_u32(v):
     sec2  = (t & 0x1F) * 2
     return (year, month, day, hour, minute, sec2)
 
+def dos_datetimes_from_u32(values):
+    # dos_datetime_from_u32 over an array, one (year, month, day, hour, minute, sec2) row per value
+    v = np.asarray(values, dtype=np.uint32)
+    return np.stack([
+        ((v >> 25) & 0x7F) + 1980,
+        (v >> 21) & 0x0F,
+        (v >> 16) & 0x1F,
+        (v >> 11) & 0x1F,
+        (v >> 5)  & 0x3F,
+        (v & 0x1F) * 2,
+    ], axis=-1)
+
 
-class PirsEntry:
-    __slots__ = ("Filename","Unknow","BlockLen","Cluster","Parent","Size","DateTime1","DateTime2","is_dir")
-    def __init__(self): pass
+# read-only view of one ENTRY_DT record, only built when entries are listed
+PirsEntry = namedtuple("PirsEntry", ("Filename","Unknow","BlockLen","Cluster","Parent","Size","DateTime1","DateTime2","is_dir"))
 
 class PirsType2:
     def __init__(self, path):
         self.path = Path(path)
         self.f = self.path.open("rb")
-        self.f.seek(0, os.SEEK_END)
-        self._pkg_size = self.f.tell()
-        self.f.seek(0)
-        self.magic = read_exact(self.f, 4)
+        # block data is sliced straight out of the mapping when extracting
+        self.mm = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._pkg_size = len(self.mm)
+        self.magic = self.mm[:4]
         if self.magic != MAGIC_CON:
             raise ValueError("Not a CON package")
 
         self.con_start  = 49152
         self.con_offset = 8192
 
-        self.entries: List[PirsEntry] = self._read_entries()
+        # every cluster that can start inside the package, looked up instead of recomputed
+        n_clusters = max(0, (self._pkg_size - self.con_start) // 4096 + 1)
+        self._offset_lut = self._cluster_offsets(np.arange(n_clusters, dtype=np.int64))
+
+        self.entries: np.ndarray = self._read_entries()
 
     def _get_offset(self, cluster):
+        if 0 <= cluster < len(self._offset_lut):
+            return int(self._offset_lut[cluster])
         num  = self.con_start + cluster * 4096
         n2   = cluster // 170
         n3   = n2 // 170
@@ -180,174 +208,313 @@ class PirsType2:
             num += (n3 + 1) * self.con_offset
         return num
 
-    def _read_entry(self):
-        e = PirsEntry()
-        e.Filename = read_fixed_str(self.f, 38)
-        if e.Filename == "":
-            return e
-        e.Unknow    = r_i32le(self.f)
-        e.BlockLen  = r_i32le(self.f)
-        raw_cluster = r_u32le(self.f)
-        e.Cluster   = raw_cluster >> 8
-        e.Parent    = r_u16le(self.f)
-        e.Size      = r_u32le(self.f)
-        dt1         = r_u32le(self.f)
-        dt2         = r_u32le(self.f)
-        e.DateTime1 = dos_datetime_from_u32(dt1)
-        e.DateTime2 = dos_datetime_from_u32(dt2)
-        
-        e.is_dir    = (e.Size == 0 and e.Cluster == 0)
-        return e
+    def _cluster_offsets(self, clusters):
+        # _get_offset over an int64 array of clusters
+        n2 = clusters // 170
+        n3 = n2 // 170
+        offs = self.con_start + clusters * 4096
+        offs += np.where(n2 > 0, (n2 + 1) * self.con_offset, 0)
+        offs += np.where(n3 > 0, (n3 + 1) * self.con_offset, 0)
+        return offs
+
+    def _offsets(self, start, count):
+        # _get_offset for clusters start .. start + count - 1 in one go
+        if 0 <= start and start + count <= len(self._offset_lut):
+            return self._offset_lut[start:start + count]
+        return self._cluster_offsets(np.arange(start, start + count, dtype=np.int64))
 
     def _read_entries(self):
-        entries: List[PirsEntry] = []
-        idx = 0
-        while True:
-            self.f.seek(self.con_start + idx * 64)
-            e = self._read_entry()
-            if e.Filename == "":
+        # the table is contiguous from con_start and ends at the first blank name
+        n_slots = max(0, (self._pkg_size - self.con_start) // ENTRY_DT.itemsize)
+        table = np.frombuffer(self.mm, dtype=ENTRY_DT, count=n_slots, offset=min(self.con_start, self._pkg_size))
+        count = 0
+        for raw in table["Filename"]:
+            if decode_fixed_str(raw) == "":
                 break
-            entries.append(e)
-            idx += 1
+            count += 1
+        else:
+            tail = self.mm[self.con_start + n_slots * ENTRY_DT.itemsize:][:38]
+            if len(tail) < 38 or decode_fixed_str(tail) != "":
+                raise EOFError("Unexpected EOF in CON entry table")
+
+        entries = table[:count].copy()
+        del table
+        entries["Cluster"] >>= 8
         return entries
 
+    def __iter__(self):
+        e = self.entries
+        dts = dos_datetimes_from_u32(np.stack([e["DateTime1"], e["DateTime2"]], axis=-1))
+        for rec, (dt1, dt2) in zip(e.tolist(), dts.tolist()):
+            name, unknow, block_len, cluster, parent, size = rec[:6]
+            yield PirsEntry(
+                decode_fixed_str(name), unknow, block_len, cluster, parent, size,
+                tuple(dt1), tuple(dt2), size == 0 and cluster == 0,
+            )
+
     def list(self):
-        return self.entries
+        return list(self)
 
     def extract_all(self, out_dir):
         out_dir.mkdir(parents=True, exist_ok=True)
+        # directories have no size, so this also skips them
+        for e in self.entries[self.entries["Size"] > 0]:
+            dst = out_dir / decode_fixed_str(e["Filename"])
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            with open(dst, "wb") as w:
+                self._extract_entry(e, w)
+
+    def read_entry(self, name):
+        bio = io.BytesIO()
+        self._extract_entry(self._by_name(name), bio)
+        return bio.getvalue()
+
+    def _by_name(self, name):
         for e in self.entries:
-            if e.is_dir:
-                continue
-            self._extract_entry(e, out_dir / e.Filename)
-
-    def _extract_entry(self, e, dst):
-        size = int(e.Size)
+            is_dir = e["Size"] == 0 and e["Cluster"] == 0
+            if not is_dir and decode_fixed_str(e["Filename"]) == name:
+                return e
+        raise FileNotFoundError(f"{name} not found in {self.path}")
+
+    def _extract_entry(self, e, w):
+        # e is an ENTRY_DT record, w any writable binary file object
+        size = int(e["Size"])
         if size <= 0:
             return
         
-        start_cluster = int(e.Cluster)
+        start_cluster = int(e["Cluster"])
         
         blocks_by_size = size >> 12
-        blocks_by_blocklen = max(0, int(getattr(e, "BlockLen", 0)))
+        blocks_by_blocklen = max(0, int(e["BlockLen"]))
         full_blocks = blocks_by_size
         if blocks_by_blocklen:
             full_blocks = min(full_blocks, blocks_by_blocklen)
         
         remainder = size - (full_blocks << 12)
         
-        dst.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(dst, "wb") as w:
-            last_off = -1
-        
-            for i in range(full_blocks):
-                off = self._get_offset(start_cluster + i)
-        
-                if off <= last_off:
-                    break
-                last_off = off
-        
+        offs = self._offsets(start_cluster, full_blocks + 1).tolist()
+        pieces = [(off, 4096) for off in offs[:full_blocks]]
+        if remainder > 0:
+            pieces.append((offs[full_blocks], remainder))
+
+        with memoryview(self.mm) as mv:
+            for off, n_bytes in self._coalesce(pieces):
                 if off >= self._pkg_size:
-                    remainder = 0
-                    break
-                    
-                to_read = min(4096, self._pkg_size - off)
-                if to_read <= 0:
-                    remainder = 0
                     break
-                    
-                self.f.seek(off)
-                w.write(read_exact(self.f, to_read))
-                if to_read < 4096:
-                    remainder = 0
+                end = off + n_bytes
+                self._copy_range(w, mv, off, min(end, self._pkg_size) - off)
+                if end > self._pkg_size:
                     break
-                    
-            if remainder > 0:
-                off = self._get_offset(start_cluster + full_blocks)
-                if off < self._pkg_size:
-                    to_read = min(remainder, self._pkg_size - off)
-                    if to_read > 0:
-                        self.f.seek(off)
-                        w.write(read_exact(self.f, to_read))
+
+    def _copy_range(self, w, mv, off, n_bytes):
+        # kernel-side copy where the platform allows it, otherwise a slice of the mapping
+        if hasattr(os, "sendfile"):
+            try:
+                out_fd = w.fileno()
+                w.flush()
+                while n_bytes > 0:
+                    sent = os.sendfile(out_fd, self.f.fileno(), off, n_bytes)
+                    if sent == 0:
+                        break
+                    off += sent
+                    n_bytes -= sent
+            except (OSError, ValueError):
+                pass
+        if n_bytes > 0:
+            w.write(mv[off:off + n_bytes])
+
+    @staticmethod
+    def _coalesce(pieces):
+        # merges (offset, length) pieces that sit back to back in the package
+        run_off, run_len = None, 0
+        for off, n_bytes in pieces:
+            if run_off is not None and off == run_off + run_len:
+                run_len += n_bytes
+                continue
+            if run_off is not None:
+                yield run_off, run_len
+            run_off, run_len = off, n_bytes
+        if run_off is not None:
+            yield run_off, run_len
 
 
 def reorder_channels(buf):
-    out = bytearray(len(buf))
+    a = np.frombuffer(buf, dtype=np.uint8).reshape(-1, 3)
+    out = np.empty_like(a)
     r_i, g_i, b_i = (2, 0, 1)
-    for i in range(0, len(buf), 3):
-        out[i + 0] = buf[i + r_i]
-        out[i + 1] = buf[i + g_i]
-        out[i + 2] = buf[i + b_i]
-    return bytes(out)
+    out[:, 0] = a[:, r_i]
+    out[:, 1] = a[:, g_i]
+    out[:, 2] = a[:, b_i]
+    return out.tobytes()
+
+
+def roll_into(dst, src, shift):
+    # dst[...] = np.roll(src, shift, axis=1), written as two slice copies with no temporary
+    shift %= src.shape[1]
+    if shift == 0:
+        dst[...] = src
+        return dst
+    dst[:, shift:] = src[:, :-shift]
+    dst[:, :shift] = src[:, -shift:]
+    return dst
 
 
 def shift_channel(buf, w, h, channel, shift_px):
+    # a writable (h, w, 3) uint8 array is shifted in place and returned,
+    # anything else is copied and returned as bytes
     ch_idx = {"r": 0, "g": 1, "b": 2}.get(channel)
 
     shift = shift_px % w
     if shift == 0:
         return buf
 
-    out = bytearray(buf)
-    row_stride = w * 3
-    for y in range(h):
-        row0 = y * row_stride
-        ch_row = out[row0 + ch_idx : row0 + row_stride : 3]
-        rotated = ch_row[-shift:] + ch_row[:-shift]
-        out[row0 + ch_idx : row0 + row_stride : 3] = rotated
-    return bytes(out)
+    if isinstance(buf, np.ndarray) and buf.flags.writeable:
+        a = buf.reshape(h, w, 3)
+        a[..., ch_idx] = np.roll(a[..., ch_idx], shift, axis=1)
+        return buf
+
+    # only the untouched channels are copied as-is, the shifted one goes straight
+    # from the source into its rotated position
+    a = np.frombuffer(buf, dtype=np.uint8).reshape(h, w, 3)
+    out = np.empty_like(a)
+    for i in range(3):
+        if i != ch_idx:
+            out[..., i] = a[..., i]
+    roll_into(out[..., ch_idx], a[..., ch_idx], shift)
+    return out.tobytes()
+
+
+if njit is not None:
+    @njit(cache=True, boundscheck=False)
+    def _swizzle(buf, w, h):
+        # same output as the numpy path below, walking each row once
+        out = np.empty(w * h * 3, dtype=np.uint8)
+        row_stride = w * 3
+        for y in range(h):
+            base = y * row_stride
+            for x in range(w):
+                o = base + x * 3
+                r = base + ((x + 3) % w) * 3
+                gb = base + ((x + 4) % w) * 3
+                out[o + 0] = buf[gb + 1]
+                out[o + 1] = buf[gb + 0]
+                out[o + 2] = buf[r + 2]
+        return out
+else:
+    _swizzle = None
+
+
+def unscramble_pixels(data, w, h):
+    # reorder_channels followed by the r/g/b shift_channel calls, done in one pass.
+    # the result is laid out as bgr so pil's raw decoder does the final swap
+    if _swizzle is not None:
+        return _swizzle(np.frombuffer(data, dtype=np.uint8), w, h).reshape(h, w, 3)
+
+    arr = np.frombuffer(data, dtype=np.uint8).reshape(h, w, 3)
+    out = np.empty_like(arr)
+    roll_into(out[..., 2], arr[..., 2], -3)
+    # g and b share the same shift and only swap places, so a reversed
+    # two-channel view moves both in one go
+    roll_into(out[..., 1::-1], arr[..., :2], -4)
+    return out
+
+
+def read_screenshot(buf, name):
+    meta = parse_header(buf)
+    w, h = meta["width"], meta["height"]
+
+    print(f"[{name}] {w}x{h}")
+
+    offset = meta["screenshot_offset"]
+    expected = w * h * 3
+    check_available(buf, offset, expected)
+    # zero-copy view of the pixel data, released again once unscrambled
+    data = np.frombuffer(buf, dtype=np.uint8, count=expected, offset=offset)
+
+    return meta, unscramble_pixels(data, w, h)
+
+
+# names are decoded as latin-1, so this covers every character they can contain
+NAME_DELETE_TABLE = str.maketrans("", "", "".join(
+    chr(c) for c in range(256) if not (chr(c).isalnum() or chr(c) in " -_")
+))
+
+
+def save_screenshot(meta, pixels, out_dir, compress_level=1):
+    w, h = meta["width"], meta["height"]
+
+    img = Image.frombuffer("RGB", (w, h), pixels, "raw", "BGR", 0, 1)
+
+    base = f"fo3_{meta['save_index']:03d}_{w}x{h}"
+    if meta["pc_name"]:
+        base += "_" + meta["pc_name"].translate(NAME_DELETE_TABLE).strip().replace(" ", "_")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / f"{base}.png"
+    # zlib level 1 is several times quicker to encode than pil's default of 6
+    # for a slightly larger file
+    img.save(out_path, format="PNG", compress_level=compress_level, optimize=False)
+    print(f"Saved {out_path}")
 
 
 def extract_image(
     save_path: Path,
     out_dir: Path,
+    compress_level: int = 1,
 ):
-    with save_path.open("rb") as f:
-        meta = parse_header(f)
-        w, h = meta["width"], meta["height"]
+    with save_path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        meta, pixels = read_screenshot(mm, save_path.name)
+    save_screenshot(meta, pixels, out_dir, compress_level)
 
-        print(f"[{save_path.name}] {w}x{h}")
 
-        f.seek(meta["screenshot_offset"])
-        expected = w * h * 3
-        data = read_exact(f, expected)
-
-        data = reorder_channels(data)
-
-        data = shift_channel(data, w, h, "r", -3)
-        data = shift_channel(data, w, h, "g", -4)
-        data = shift_channel(data, w, h, "b", -4)
-
-        img = Image.frombytes("RGB", (w, h), data)
-
-        base = f"fo3_{meta['save_index']:03d}_{w}x{h}"
-        if meta["pc_name"]:
-            base += "_" + "".join(
-                ch for ch in meta["pc_name"] if ch.isalnum() or ch in " -_"
-            ).strip().replace(" ", "_")
-        out_dir.mkdir(parents=True, exist_ok=True)
-        out_path = out_dir / f"{base}.png"
-        img.save(out_path)
-        print(f"Saved {out_path}")
+def extract_image_from_bytes(
+    data: bytes,
+    name: str,
+    out_dir: Path,
+    compress_level: int = 1,
+):
+    meta, pixels = read_screenshot(data, name)
+    save_screenshot(meta, pixels, out_dir, compress_level)
+
+
+def process_save(save_file, out_dir, compress_level=1):
+    if '.fxs' in save_file.lower():
+        p = PirsType2(Path(save_file))
+        for e in p.list():
+            kind = "DIR " if e.is_dir else "FILE"
+            print(f"{kind:4} {e.Size:10}  cl={e.Cluster:6}  {e.Filename}")
+        # only the save itself is needed, so it never touches the disk
+        extract_image_from_bytes(
+            p.read_entry("Savegame.dat"),
+            "Savegame.dat",
+            out_dir,
+            compress_level,
+        )
+        return
+    extract_image(
+        Path(save_file),
+        out_dir,
+        compress_level,
+    )
 
 
 def main():
-    args = sys.argv[1:]
+    parser = argparse.ArgumentParser(description="extract screenshots from fallout 3 / new vegas saves")
+    parser.add_argument("saves", nargs="*", metavar="PATH_TO_FILE")
+    parser.add_argument(
+        "--compress-level", type=int, default=1, choices=range(10), metavar="0-9",
+        help="png zlib compression level (default: 1)",
+    )
+    args = parser.parse_args()
     out_dir = Path("extracted_images")
-    for save_file in args:
-        if '.fxs' in save_file.lower():
-            p = PirsType2(Path(save_file))
-            for e in p.list():
-                kind = "DIR " if e.is_dir else "FILE"
-                print(f"{kind:4} {e.Size:10}  cl={e.Cluster:6}  {e.Filename}")
-            p.extract_all(out_dir)
-            save_file = out_dir / 'Savegame.dat'
-        extract_image(
-            Path(save_file),
-            out_dir
-        )
+    job = functools.partial(process_save, out_dir=out_dir, compress_level=args.compress_level)
+
+    if len(args.saves) > 1:
+        with ProcessPoolExecutor() as ex:
+            list(ex.map(job, args.saves))
+    else:
+        for save_file in args.saves:
+            job(save_file)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()